@@ -3,29 +3,107 @@ API Endpoints
 REST API routes for video analysis
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel, HttpUrl
-from sqlalchemy.orm import Session
-from typing import Optional
-from app.models.database import get_db
-from app.models.models import AnalysisJob
-from app.worker.tasks import analyze_video_task
+import hashlib
+from datetime import datetime, timedelta, timezone
+from fastapi import APIRouter, HTTPException, Request, Response
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, HttpUrl
+from sqlalchemy import select
+from sqlalchemy.orm import defer
+from redis import RedisError
+from typing import Optional, Tuple
+from app.core.cache import async_redis_client
+from app.models.database import AsyncSessionLocal
+from app.models.models import AnalysisJob, TranscriptSegment
+from app.services.downloader import extract_video_id
+from app.worker.tasks import analyze_video_pipeline
 
 
 router = APIRouter()
 
+# Finished jobs never change, so their responses can be served from Redis
+TERMINAL_STATUSES = ("completed", "failed")
+JOB_CACHE_TTL = 3600
+
+# ...and browsers/proxies may reuse them without revalidating
+FINISHED_JOB_CACHE_CONTROL = "public, max-age=3600, immutable"
+
+# Submissions of a video analyzed (or in progress) within this window reuse that job
+DEDUP_STATUSES = ("pending", "processing", "completed")
+DEDUP_WINDOW = timedelta(hours=24)
+
+# Columns needed for a StatusResponse (skips the large result JSON)
+STATUS_COLUMNS = (
+    AnalysisJob.id,
+    AnalysisJob.youtube_url,
+    AnalysisJob.video_title,
+    AnalysisJob.status,
+    AnalysisJob.created_at,
+    AnalysisJob.completed_at,
+    AnalysisJob.error_message,
+)
+
+
+async def _get_cached(key: str) -> Tuple[Optional[str], Optional[str]]:
+    """Read a cached (etag, payload) pair (cache misses and errors return None)"""
+    try:
+        etag, payload = await async_redis_client.mget(f"{key}:etag", key)
+        return etag, payload
+    except RedisError:
+        return None, None
+
+
+async def _set_cached(key: str, etag: str, payload: str):
+    """Store a response payload with its ETag, ignoring cache errors"""
+    try:
+        async with async_redis_client.pipeline(transaction=False) as pipe:
+            pipe.setex(f"{key}:etag", JOB_CACHE_TTL, etag)
+            pipe.setex(key, JOB_CACHE_TTL, payload)
+            await pipe.execute()
+    except RedisError:
+        pass
+
+
+def _job_etag(job) -> str:
+    """ETag for a finished job's responses"""
+    return '"%s"' % hashlib.md5(f"{job.job_id}:{job.completed_at}".encode()).hexdigest()
+
+
+def _cache_headers(etag: str) -> dict:
+    """HTTP cache headers for a finished job's responses"""
+    return {"ETag": etag, "Cache-Control": FINISHED_JOB_CACHE_CONTROL}
+
+
+def _not_modified(request: Request, response: Response, job) -> Optional[Response]:
+    """
+    Attach HTTP cache headers to finished jobs
+    
+    Returns a 304 response if the client's cached copy (If-None-Match)
+    is still current, otherwise None
+    """
+    if job.status not in TERMINAL_STATUSES:
+        return None
+    
+    etag = _job_etag(job)
+    
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=_cache_headers(etag))
+    
+    response.headers.update(_cache_headers(etag))
+    return None
+
 
 # Request/Response Models
 class AnalyzeRequest(BaseModel):
     """Request model for video analysis"""
     youtube_url: HttpUrl
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "youtube_url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
             }
         }
+    )
 
 
 class AnalyzeResponse(BaseModel):
@@ -34,45 +112,50 @@ class AnalyzeResponse(BaseModel):
     status: str
     message: str
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "job_id": 123,
                 "status": "pending",
                 "message": "Analysis job submitted successfully"
             }
         }
+    )
 
 
 class StatusResponse(BaseModel):
     """Response model for job status"""
-    job_id: int
+    # Built straight from AnalysisJob rows (job_id is read from the id column)
+    model_config = ConfigDict(from_attributes=True)
+    
+    job_id: int = Field(validation_alias=AliasChoices("job_id", "id"))
     youtube_url: str
     video_title: Optional[str]
     status: str
-    created_at: str
-    completed_at: Optional[str]
+    created_at: datetime
+    completed_at: Optional[datetime]
     error_message: Optional[str]
 
 
 class ResultResponse(BaseModel):
     """Response model for analysis results"""
-    job_id: int
+    model_config = ConfigDict(from_attributes=True)
+    
+    job_id: int = Field(validation_alias=AliasChoices("job_id", "id"))
     youtube_url: str
     video_title: Optional[str]
     status: str
     result: Optional[dict]
     error_message: Optional[str]
-    created_at: str
-    completed_at: Optional[str]
+    created_at: datetime
+    completed_at: Optional[datetime]
 
 
 # Endpoints
 
 @router.post("/analyze", response_model=AnalyzeResponse)
 async def submit_analysis(
-    request: AnalyzeRequest,
-    db: Session = Depends(get_db)
+    request: AnalyzeRequest
 ):
     """
     Submit a YouTube video URL for analysis
@@ -84,19 +167,48 @@ async def submit_analysis(
     4. Checked for dangerous/harmful content
     
     Returns a job_id to check status and results
+    If the same video was already submitted recently, its existing job_id is returned
     """
     
-    # Create new analysis job in database
-    job = AnalysisJob(
-        youtube_url=str(request.youtube_url),
-        status="pending"
-    )
-    db.add(job)
-    db.commit()
-    db.refresh(job)
+    youtube_url = str(request.youtube_url)
+    video_id = extract_video_id(youtube_url)
     
-    # Submit task to Celery worker (async)
-    analyze_video_task.delay(job.id)
+    # Sessions are scoped to the queries themselves, so the pooled
+    # connection is returned before any other awaits in the request
+    async with AsyncSessionLocal() as db:
+        # Reuse a recent job for the same video instead of re-running the pipeline
+        if video_id:
+            stmt = (
+                select(AnalysisJob.id, AnalysisJob.status)
+                .where(
+                    AnalysisJob.video_id == video_id,
+                    AnalysisJob.status.in_(DEDUP_STATUSES),
+                    AnalysisJob.created_at > datetime.now(timezone.utc) - DEDUP_WINDOW
+                )
+                .order_by(AnalysisJob.created_at.desc())
+                .limit(1)
+            )
+            existing = (await db.execute(stmt)).first()
+            
+            if existing:
+                return AnalyzeResponse(
+                    job_id=existing.id,
+                    status=existing.status,
+                    message="Returning cached analysis. Use the job_id to check status."
+                )
+        
+        # Create new analysis job in database
+        job = AnalysisJob(
+            youtube_url=youtube_url,
+            video_id=video_id,
+            status="pending"
+        )
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+    
+    # Submit task chain to Celery workers (async)
+    analyze_video_pipeline(job.id).delay()
     
     return AnalyzeResponse(
         job_id=job.id,
@@ -108,7 +220,8 @@ async def submit_analysis(
 @router.get("/status/{job_id}", response_model=StatusResponse)
 async def get_analysis_status(
     job_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response
 ):
     """
     Check the status of an analysis job
@@ -120,62 +233,92 @@ async def get_analysis_status(
     - failed: Job encountered an error
     """
     
-    job = db.query(AnalysisJob).filter(AnalysisJob.id == job_id).first()
-    
-    if not job:
-        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    cache_key = f"job:{job_id}:status"
+    etag, cached = await _get_cached(cache_key)
+    if cached:
+        # Revalidation only needs the cached ETag, not the payload or the database
+        if etag and request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=_cache_headers(etag))
+        job_status = StatusResponse.model_validate_json(cached)
+    else:
+        stmt = select(*STATUS_COLUMNS).where(AnalysisJob.id == job_id)
+        async with AsyncSessionLocal() as db:
+            job = (await db.execute(stmt)).first()
+        
+        if not job:
+            raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+        
+        job_status = StatusResponse.model_validate(job)
+        
+        if job.status in TERMINAL_STATUSES:
+            await _set_cached(cache_key, _job_etag(job_status), job_status.model_dump_json())
     
-    return StatusResponse(
-        job_id=job.id,
-        youtube_url=job.youtube_url,
-        video_title=job.video_title,
-        status=job.status,
-        created_at=job.created_at.isoformat() if job.created_at else None,
-        completed_at=job.completed_at.isoformat() if job.completed_at else None,
-        error_message=job.error_message
-    )
+    return _not_modified(request, response, job_status) or job_status
 
 
 @router.get("/result/{job_id}", response_model=ResultResponse)
 async def get_analysis_result(
     job_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response
 ):
     """
     Get the full analysis results for a completed job
     
-    Returns video info, transcription, and AI/danger analysis results
+    Returns video info, transcription (with timestamped segments),
+    and AI/danger analysis results
     Only available when status is "completed"
     """
     
-    job = db.query(AnalysisJob).filter(AnalysisJob.id == job_id).first()
+    cache_key = f"job:{job_id}:result"
+    etag, cached = await _get_cached(cache_key)
+    if cached:
+        # Revalidation only needs the cached ETag, not the payload or the database
+        if etag and request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=_cache_headers(etag))
+        job_result = ResultResponse.model_validate_json(cached)
+    else:
+        stmt = select(AnalysisJob).where(AnalysisJob.id == job_id)
+        async with AsyncSessionLocal() as db:
+            job = (await db.execute(stmt)).scalar_one_or_none()
+            
+            segments = []
+            if job and job.status == "completed":
+                segment_stmt = (
+                    select(TranscriptSegment.start, TranscriptSegment.end, TranscriptSegment.text)
+                    .where(TranscriptSegment.job_id == job_id)
+                    .order_by(TranscriptSegment.idx)
+                    .execution_options(yield_per=500)
+                )
+                segments = [
+                    {"start": seg.start, "end": seg.end, "text": seg.text}
+                    async for seg in await db.stream(segment_stmt)
+                ]
+        
+        if not job:
+            raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+        
+        if job.status == "pending" or job.status == "processing":
+            raise HTTPException(
+                status_code=202, 
+                detail=f"Job is still {job.status}. Please check back later."
+            )
+        
+        job_result = ResultResponse.model_validate(job)
+        
+        # Jobs stored before segments moved to their own table keep them inline
+        if job_result.result and "transcription" in job_result.result:
+            job_result.result["transcription"].setdefault("segments", segments)
+        
+        await _set_cached(cache_key, _job_etag(job_result), job_result.model_dump_json())
     
-    if not job:
-        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
-    
-    if job.status == "pending" or job.status == "processing":
-        raise HTTPException(
-            status_code=202, 
-            detail=f"Job is still {job.status}. Please check back later."
-        )
-    
-    return ResultResponse(
-        job_id=job.id,
-        youtube_url=job.youtube_url,
-        video_title=job.video_title,
-        status=job.status,
-        result=job.result,
-        error_message=job.error_message,
-        created_at=job.created_at.isoformat() if job.created_at else None,
-        completed_at=job.completed_at.isoformat() if job.completed_at else None
-    )
+    return _not_modified(request, response, job_result) or job_result
 
 
 @router.get("/jobs", response_model=list[StatusResponse])
 async def list_jobs(
     limit: int = 20,
-    status: Optional[str] = None,
-    db: Session = Depends(get_db)
+    status: Optional[str] = None
 ):
     """
     List recent analysis jobs
@@ -185,22 +328,16 @@ async def list_jobs(
     - status: Filter by status (pending, processing, completed, failed)
     """
     
-    query = db.query(AnalysisJob).order_by(AnalysisJob.created_at.desc())
+    stmt = (
+        select(AnalysisJob)
+        .options(defer(AnalysisJob.result_compressed))
+        .order_by(AnalysisJob.created_at.desc())
+    )
     
     if status:
-        query = query.filter(AnalysisJob.status == status)
-    
-    jobs = query.limit(limit).all()
-    
-    return [
-        StatusResponse(
-            job_id=job.id,
-            youtube_url=job.youtube_url,
-            video_title=job.video_title,
-            status=job.status,
-            created_at=job.created_at.isoformat() if job.created_at else None,
-            completed_at=job.completed_at.isoformat() if job.completed_at else None,
-            error_message=job.error_message
-        )
-        for job in jobs
-    ]
+        stmt = stmt.where(AnalysisJob.status == status)
+    
+    async with AsyncSessionLocal() as db:
+        jobs = (await db.execute(stmt.limit(limit))).scalars().all()
+    
+    return [StatusResponse.model_validate(job) for job in jobs]
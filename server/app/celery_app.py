@@ -2,8 +2,12 @@
 Celery Application Configuration
 """
 
+import threading
 from celery import Celery
+from celery.signals import setup_logging, worker_process_init
 from app.core.config import settings
+from app.core.logging_config import setup_logging as setup_queue_logging
+from app.services.transcriber import WhisperTranscriber
 
 # Create Celery app
 celery_app = Celery(
@@ -22,7 +26,58 @@ celery_app.conf.update(
     task_track_started=True,
     task_time_limit=3600,  # 1 hour max per task
     task_soft_time_limit=3300,  # 55 minutes soft limit
+    # Reuse Redis connections instead of reconnecting on every publish
+    broker_pool_limit=10,
+    broker_transport_options={
+        "socket_keepalive": True,
+        "visibility_timeout": 7200,  # Longer than task_time_limit, so running tasks are not redelivered
+    },
+    redis_max_connections=settings.REDIS_MAX_CONNECTIONS,
+    result_backend_transport_options={"socket_keepalive": True},
+    # Logging is configured by setup_queue_logging below
+    worker_hijack_root_logger=False,
 )
 
+
+@setup_logging.connect
+def configure_logging(loglevel=None, **kwargs):
+    """Replace Celery's logging setup with queue-based logging"""
+    setup_queue_logging(loglevel or "INFO")
+
 # Auto-discover tasks from worker module
 celery_app.autodiscover_tasks(["app.worker"])
+
+
+# Whisper model shared by every task in this worker process
+WHISPER = None
+_whisper_lock = threading.Lock()
+
+
+def get_transcriber() -> WhisperTranscriber:
+    """Return the worker's Whisper transcriber, loading the model on first use"""
+    global WHISPER
+    # Blocks until a background preload (if any) has finished
+    with _whisper_lock:
+        if WHISPER is None:
+            transcriber = WhisperTranscriber()
+            transcriber.load_model()
+            WHISPER = transcriber
+    return WHISPER
+
+
+def preload_transcriber():
+    """Start loading Whisper in a background thread"""
+    threading.Thread(target=get_transcriber, name="whisper-preload", daemon=True).start()
+
+
+@worker_process_init.connect
+def load_whisper_model(**kwargs):
+    """
+    Load Whisper once per worker process instead of once per task
+    
+    Loading runs in the background so the worker starts consuming right
+    away; the model load overlaps with the first job's download on the
+    fast queue instead of sitting on its critical path.
+    """
+    if "gpu" in celery_app.amqp.queues.consume_from:
+        preload_transcriber()
@@ -0,0 +1,26 @@
+"""
+Redis Connection Pools
+Shared, bounded connection pools for application-level Redis access (caching)
+"""
+
+import redis
+import redis.asyncio
+from app.core.config import settings
+
+# Sync client (Celery worker, services)
+redis_pool = redis.ConnectionPool.from_url(
+    settings.REDIS_URL,
+    max_connections=settings.REDIS_MAX_CONNECTIONS,
+    socket_keepalive=True,
+    decode_responses=True
+)
+redis_client = redis.Redis(connection_pool=redis_pool)
+
+# Async client (FastAPI endpoints)
+async_redis_pool = redis.asyncio.ConnectionPool.from_url(
+    settings.REDIS_URL,
+    max_connections=settings.REDIS_MAX_CONNECTIONS,
+    socket_keepalive=True,
+    decode_responses=True
+)
+async_redis_client = redis.asyncio.Redis(connection_pool=async_redis_pool)
@@ -12,9 +12,16 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    # Keep DB_POOL_SIZE * processes below PostgreSQL's max_connections
+    # (the API's WEB_CONCURRENCY worker processes share one DB_POOL_SIZE)
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 3600  # Seconds before a connection is replaced
     
     # Redis
     REDIS_URL: str
+    REDIS_MAX_CONNECTIONS: int = 50  # Per-process connection pool limit
     
     # API Keys
     OPENAI_API_KEY: Optional[str] = None
@@ -23,10 +30,12 @@ class Settings(BaseSettings):
     # Application
     SECRET_KEY: str
     ENVIRONMENT: str = "development"
+    WEB_CONCURRENCY: int = 1  # API worker processes (read by gunicorn as well)
     
     # LLM Configuration
     LLM_PROVIDER: str = "gemini"  # Options: "openai", "gemini"
     WHISPER_MODEL_SIZE: str = "base"  # Options: "tiny", "base", "small", "medium", "large"
+    WHISPER_BATCH_SIZE: int = 16  # Audio chunks decoded per batched encoder/decoder pass
     
     # CORS
     FRONTEND_URL: str = "http://localhost:3000"
@@ -0,0 +1,58 @@
+"""
+Logging Configuration
+Log records are handed to a queue and written to stderr by a background
+listener thread, so formatting and I/O stay off the request/task path
+"""
+
+import atexit
+import logging
+import os
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+
+_listener: Optional[QueueListener] = None
+
+
+def _start_listener(handler: logging.Handler):
+    """Route root logger records through a fresh queue and listener thread"""
+    global _listener
+    log_queue = queue.SimpleQueue()
+    
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(QueueHandler(log_queue))
+    
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+
+
+def _stop_listener():
+    """Flush queued records on interpreter exit"""
+    if _listener is not None:
+        _listener.stop()
+
+
+def setup_logging(level=logging.INFO):
+    """
+    Configure queue-based logging for the current process (idempotent)
+    
+    Args:
+        level: Root log level (name or number)
+    """
+    if _listener is not None:
+        return
+    
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    
+    _start_listener(handler)
+    logging.getLogger().setLevel(level)
+    
+    atexit.register(_stop_listener)
+    # Threads don't survive fork(), so forked worker processes start their own listener
+    os.register_at_fork(after_in_child=lambda: _start_listener(handler))
@@ -3,24 +3,28 @@ FastAPI Main Application
 Entry point for the web server
 """
 
+import logging
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from app.core.config import settings
-from app.models.database import init_db
+from app.core.logging_config import setup_logging
 from app.api.endpoints import router
 
+setup_logging()
+logger = logging.getLogger(__name__)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
-    # Startup: Initialize database
-    print("🚀 Initializing database...")
-    init_db()
-    print("✅ Database initialized")
+    # The schema is migrated once before the server starts (alembic upgrade head),
+    # not by each worker process here
+    logger.info("🚀 Starting up...")
     yield
     # Shutdown: Cleanup if needed
-    print("👋 Shutting down...")
+    logger.info("👋 Shutting down...")
 
 
 # Create FastAPI application
@@ -28,6 +32,7 @@ app = FastAPI(
     title="YouTube AI Content Detector API",
     description="Detect AI-generated and dangerous content from YouTube videos",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
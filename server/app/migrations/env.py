@@ -0,0 +1,60 @@
+"""
+Alembic Migration Environment
+Runs migrations against settings.DATABASE_URL
+"""
+
+from logging.config import fileConfig
+from alembic import context
+from sqlalchemy import create_engine, pool, text
+from app.core.config import settings
+from app.models.database import Base
+from app.models import models  # noqa: F401 (registers the models on Base.metadata)
+
+config = context.config
+
+# Only the alembic CLI configures logging; the app keeps its own setup
+if config.cmd_opts is not None and config.config_file_name is not None:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+# PostgreSQL advisory lock key held while migrating (any constant unique to this app)
+MIGRATION_LOCK_KEY = 727162
+
+
+def run_migrations_offline():
+    """Emit the migration SQL without connecting (alembic upgrade --sql)"""
+    context.configure(
+        url=settings.DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"}
+    )
+    
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    """Run migrations on a live database connection"""
+    connectable = create_engine(settings.DATABASE_URL, poolclass=pool.NullPool)
+    
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=connection.dialect.name == "sqlite"
+        )
+        
+        with context.begin_transaction():
+            # Containers started together each run the upgrade; the lock (released
+            # at commit) lets one migrate while the others wait and find nothing to do
+            if connection.dialect.name == "postgresql":
+                connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
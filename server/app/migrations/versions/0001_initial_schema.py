@@ -0,0 +1,38 @@
+"""Initial schema (analysis_jobs as created before migrations existed)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-15
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases created by the old Base.metadata.create_all() already have the table
+    if sa.inspect(op.get_bind()).has_table("analysis_jobs"):
+        return
+    
+    op.create_table(
+        "analysis_jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("youtube_url", sa.String(), nullable=False),
+        sa.Column("video_title", sa.String(), nullable=True),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_analysis_jobs_id", "analysis_jobs", ["id"])
+
+
+def downgrade():
+    op.drop_table("analysis_jobs")
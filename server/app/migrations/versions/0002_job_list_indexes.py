@@ -0,0 +1,33 @@
+"""Index analysis_jobs on created_at and (status, created_at)
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    indexes = {ix["name"] for ix in sa.inspect(op.get_bind()).get_indexes("analysis_jobs")}
+    
+    if "ix_analysis_jobs_created_at" not in indexes:
+        op.create_index("ix_analysis_jobs_created_at", "analysis_jobs", ["created_at"])
+    if "ix_analysis_jobs_status_created_at" not in indexes:
+        op.create_index(
+            "ix_analysis_jobs_status_created_at",
+            "analysis_jobs",
+            ["status", sa.text("created_at DESC")]
+        )
+
+
+def downgrade():
+    op.drop_index("ix_analysis_jobs_status_created_at", table_name="analysis_jobs")
+    op.drop_index("ix_analysis_jobs_created_at", table_name="analysis_jobs")
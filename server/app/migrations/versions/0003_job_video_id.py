@@ -0,0 +1,51 @@
+"""Add analysis_jobs.video_id and backfill it from youtube_url
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-15
+"""
+
+import re
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+# Same pattern as app.services.downloader.VIDEO_ID_PATTERN when this revision was written
+VIDEO_ID_PATTERN = re.compile(r'(?:v=|youtu\.be/|shorts/|embed/)([\w-]{11})')
+
+jobs = sa.table(
+    "analysis_jobs",
+    sa.column("id", sa.Integer),
+    sa.column("youtube_url", sa.String),
+    sa.column("video_id", sa.String),
+)
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    
+    if "video_id" not in {col["name"] for col in inspector.get_columns("analysis_jobs")}:
+        op.add_column("analysis_jobs", sa.Column("video_id", sa.String(11), nullable=True))
+    if "ix_analysis_jobs_video_id" not in {ix["name"] for ix in inspector.get_indexes("analysis_jobs")}:
+        op.create_index("ix_analysis_jobs_video_id", "analysis_jobs", ["video_id"])
+    
+    # Let resubmissions of videos analyzed before this column existed reuse their jobs
+    rows = bind.execute(
+        sa.select(jobs.c.id, jobs.c.youtube_url).where(jobs.c.video_id.is_(None))
+    ).all()
+    for row in rows:
+        match = VIDEO_ID_PATTERN.search(row.youtube_url)
+        if match:
+            bind.execute(jobs.update().where(jobs.c.id == row.id).values(video_id=match.group(1)))
+
+
+def downgrade():
+    op.drop_index("ix_analysis_jobs_video_id", table_name="analysis_jobs")
+    with op.batch_alter_table("analysis_jobs") as batch_op:
+        batch_op.drop_column("video_id")
@@ -0,0 +1,39 @@
+"""Create the transcript_segments table
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-15
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table("transcript_segments"):
+        return
+    
+    # Segments of jobs finished before this table existed stay inline in their result
+    op.create_table(
+        "transcript_segments",
+        sa.Column(
+            "job_id",
+            sa.Integer(),
+            sa.ForeignKey("analysis_jobs.id", ondelete="CASCADE"),
+            primary_key=True
+        ),
+        sa.Column("idx", sa.Integer(), primary_key=True),
+        sa.Column("start", sa.Float(), nullable=False),
+        sa.Column("end", sa.Float(), nullable=False),
+        sa.Column("text", sa.Text(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("transcript_segments")
@@ -0,0 +1,71 @@
+"""Move analysis_jobs.result into Brotli-compressed result_compressed
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-15
+"""
+
+import brotli
+import orjson
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+# Rows are converted in batches so large tables are never loaded at once
+BATCH_SIZE = 500
+
+jobs = sa.table(
+    "analysis_jobs",
+    sa.column("id", sa.Integer),
+    sa.column("result", sa.JSON),
+    sa.column("result_compressed", sa.LargeBinary),
+)
+
+
+def _convert(bind, source, convert):
+    """Rewrite every non-null value of one result column into the other, in id order"""
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(jobs.c.id, jobs.c[source])
+            .where(jobs.c.id > last_id, jobs.c[source].isnot(None))
+            .order_by(jobs.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+        
+        for job_id, value in rows:
+            bind.execute(jobs.update().where(jobs.c.id == job_id).values(convert(value)))
+        last_id = rows[-1][0]
+
+
+def upgrade():
+    bind = op.get_bind()
+    columns = {col["name"] for col in sa.inspect(bind).get_columns("analysis_jobs")}
+    
+    if "result_compressed" not in columns:
+        op.add_column("analysis_jobs", sa.Column("result_compressed", sa.LargeBinary(), nullable=True))
+    
+    if "result" in columns:
+        # Same encoding as the AnalysisJob.result setter
+        _convert(bind, "result", lambda value: {
+            "result_compressed": brotli.compress(orjson.dumps(value), quality=4)
+        })
+        with op.batch_alter_table("analysis_jobs") as batch_op:
+            batch_op.drop_column("result")
+
+
+def downgrade():
+    op.add_column("analysis_jobs", sa.Column("result", sa.JSON(), nullable=True))
+    
+    _convert(op.get_bind(), "result_compressed", lambda value: {
+        "result": orjson.loads(brotli.decompress(value))
+    })
+    with op.batch_alter_table("analysis_jobs") as batch_op:
+        batch_op.drop_column("result_compressed")
@@ -3,13 +3,19 @@ Database Connection and Session Management
 """
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
-# Create database engine
+# Create database engine (used by the Celery worker)
 engine = create_engine(
     settings.DATABASE_URL,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
     pool_pre_ping=True,
     echo=settings.ENVIRONMENT == "development"
 )
@@ -17,19 +23,25 @@ engine = create_engine(
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-# Base class for ORM models
-Base = declarative_base()
-
-
-def get_db():
-    """Dependency for getting database sessions"""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# Async engine for the API, so queries don't block the event loop
+# (the pool is split between the API worker processes)
+async_engine = create_async_engine(
+    make_url(settings.DATABASE_URL).set(drivername="postgresql+asyncpg"),
+    pool_size=max(1, settings.DB_POOL_SIZE // settings.WEB_CONCURRENCY),
+    max_overflow=settings.DB_MAX_OVERFLOW // settings.WEB_CONCURRENCY,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=True,
+    echo=settings.ENVIRONMENT == "development"
+)
 
+# Create async session factory
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
 
-def init_db():
-    """Initialize database tables"""
-    Base.metadata.create_all(bind=engine)
+# Base class for ORM models
+Base = declarative_base()
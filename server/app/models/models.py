@@ -3,7 +3,10 @@ Database Models
 SQLAlchemy ORM models for the application
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Text, JSON
+import brotli
+import orjson
+from typing import Any, Dict, Optional
+from sqlalchemy import Column, Integer, String, DateTime, Text, LargeBinary, Index, Float, ForeignKey
 from sqlalchemy.sql import func
 from .database import Base
 
@@ -15,20 +18,55 @@ class AnalysisJob(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     youtube_url = Column(String, nullable=False)
+    # Canonical YouTube video ID, used to reuse analyses of the same video
+    video_id = Column(String(11), nullable=True, index=True)
     video_title = Column(String, nullable=True)
     
     # Job status: "pending", "processing", "completed", "failed"
     status = Column(String, default="pending", nullable=False)
     
-    # Analysis results stored as JSON
-    result = Column(JSON, nullable=True)
+    # Analysis results stored as Brotli-compressed JSON, accessed via `result`
+    # (timestamped segments live in TranscriptSegment)
+    result_compressed = Column(LargeBinary, nullable=True)
     
     # Error message if job failed
     error_message = Column(Text, nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     completed_at = Column(DateTime(timezone=True), nullable=True)
     
+    # Serves the job list: newest first, optionally filtered by status
+    __table_args__ = (
+        Index("ix_analysis_jobs_status_created_at", "status", created_at.desc()),
+    )
+    
+    @property
+    def result(self) -> Optional[Dict[str, Any]]:
+        """Analysis results, decompressed from result_compressed"""
+        if self.result_compressed is None:
+            return None
+        return orjson.loads(brotli.decompress(self.result_compressed))
+    
+    @result.setter
+    def result(self, value: Optional[Dict[str, Any]]):
+        self.result_compressed = None if value is None else brotli.compress(orjson.dumps(value), quality=4)
+    
     def __repr__(self):
         return f"<AnalysisJob(id={self.id}, url={self.youtube_url}, status={self.status})>"
+
+
+class TranscriptSegment(Base):
+    """Model for timestamped transcription segments, stored as Whisper emits them"""
+    
+    __tablename__ = "transcript_segments"
+    
+    job_id = Column(Integer, ForeignKey("analysis_jobs.id", ondelete="CASCADE"), primary_key=True)
+    idx = Column(Integer, primary_key=True)
+    
+    start = Column(Float, nullable=False)
+    end = Column(Float, nullable=False)
+    text = Column(Text, nullable=False)
+    
+    def __repr__(self):
+        return f"<TranscriptSegment(job_id={self.job_id}, idx={self.idx}, start={self.start})>"
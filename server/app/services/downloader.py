@@ -3,11 +3,27 @@ YouTube Video Downloader Service
 Uses yt-dlp to download videos and extract metadata
 """
 
+import json
 import os
+import re
+import redis
 import yt_dlp
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from app.core.cache import redis_client
 from app.core.config import settings
 
+# Matches the 11-character video ID in watch, shorts, embed and youtu.be URLs
+VIDEO_ID_PATTERN = re.compile(r'(?:v=|youtu\.be/|shorts/|embed/)([\w-]{11})')
+
+# Video metadata is cached for 24 hours
+VIDEO_INFO_TTL = 86400
+
+
+def extract_video_id(url: str) -> Optional[str]:
+    """Extract the YouTube video ID from a URL (None if not recognized)"""
+    match = VIDEO_ID_PATTERN.search(url)
+    return match.group(1) if match else None
+
 
 class YouTubeDownloader:
     """Service for downloading YouTube videos using yt-dlp"""
@@ -20,12 +36,26 @@ class YouTubeDownloader:
         """
         Extract video metadata without downloading
         
+        Results are cached in Redis by video ID, so repeat submissions
+        of the same video skip the yt-dlp extractor entirely.
+        
         Args:
             url: YouTube video URL
             
         Returns:
             Dictionary with video metadata
         """
+        video_id = extract_video_id(url)
+        cache_key = f"vinfo:{video_id}" if video_id else None
+        
+        if cache_key:
+            try:
+                cached = redis_client.get(cache_key)
+                if cached:
+                    return json.loads(cached)
+            except redis.RedisError:
+                pass  # Cache is best-effort, fall back to yt-dlp
+        
         ydl_opts = {
             'quiet': True,
             'no_warnings': True,
@@ -42,7 +72,7 @@ class YouTubeDownloader:
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
             info = ydl.extract_info(url, download=False)
             
-            return {
+            video_info = {
                 'id': info.get('id'),
                 'title': info.get('title'),
                 'duration': info.get('duration'),
@@ -52,6 +82,14 @@ class YouTubeDownloader:
                 'thumbnail': info.get('thumbnail'),
                 'description': info.get('description', '')[:500],  # First 500 chars
             }
+        
+        if cache_key:
+            try:
+                redis_client.setex(cache_key, VIDEO_INFO_TTL, json.dumps(video_info))
+            except redis.RedisError:
+                pass
+        
+        return video_info
     
     def download_video(self, url: str, output_filename: str = None) -> str:
         """
@@ -93,7 +131,7 @@ class YouTubeDownloader:
     
     def download_audio_only(self, url: str, output_filename: str = None) -> str:
         """
-        Download only audio from YouTube video (faster and smaller)
+        Download only audio from YouTube video as 16kHz mono WAV (ready for Whisper)
         
         Args:
             url: YouTube video URL
@@ -120,17 +158,22 @@ class YouTubeDownloader:
                     'skip': ['hls', 'dash']
                 }
             },
+            # Decode straight to 16kHz mono PCM WAV (Whisper's native input format)
+            # so no second FFmpeg pass is needed before transcription
             'postprocessors': [{
                 'key': 'FFmpegExtractAudio',
-                'preferredcodec': 'mp3',
-                'preferredquality': '192',
+                'preferredcodec': 'wav',
+                'preferredquality': '0',
             }],
+            'postprocessor_args': {
+                'extractaudio': ['-ar', '16000', '-ac', '1', '-acodec', 'pcm_s16le'],
+            },
         }
         
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
             info = ydl.extract_info(url, download=True)
-            # Audio file will have .mp3 extension after post-processing
+            # Audio file will have .wav extension after post-processing
             video_id = info.get('id')
-            audio_filename = os.path.join(self.temp_dir, f"{video_id}.mp3")
+            audio_filename = os.path.join(self.temp_dir, f"{video_id}.wav")
             
         return audio_filename
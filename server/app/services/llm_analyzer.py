@@ -3,9 +3,12 @@ LLM Analyzer Service
 Uses Gemini or GPT APIs to analyze transcribed content for AI generation and dangerous content
 """
 
+import logging
 from typing import Dict, Any, Optional
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 
 class LLMAnalyzer:
     """Service for analyzing content using LLM APIs (Gemini or OpenAI GPT)"""
@@ -26,14 +29,16 @@ class LLMAnalyzer:
         """Initialize the appropriate LLM client"""
         if self.provider == "gemini":
             import google.generativeai as genai
-            genai.configure(api_key=settings.GEMINI_API_KEY)
+            # REST goes through Python sockets, which the fast queue's eventlet pool
+            # patches; the default gRPC transport would block (or hang) the hub
+            genai.configure(api_key=settings.GEMINI_API_KEY, transport="rest")
             self.client = genai.GenerativeModel('gemini-2.5-flash')
-            print("✅ Gemini client initialized (gemini-2.5-flash)")
+            logger.info("✅ Gemini client initialized (gemini-2.5-flash)")
         
         elif self.provider == "openai":
             from openai import OpenAI
             self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
-            print("✅ OpenAI client initialized")
+            logger.info("✅ OpenAI client initialized")
         
         else:
             raise ValueError(f"Unsupported LLM provider: {self.provider}")
@@ -58,7 +63,7 @@ class LLMAnalyzer:
         """
         prompt = self._build_analysis_prompt(transcription, video_metadata)
         
-        print(f"🤖 Analyzing content with {self.provider.upper()}...")
+        logger.info("🤖 Analyzing content with %s...", self.provider.upper())
         
         if self.provider == "gemini":
             result = self._analyze_with_gemini(prompt)
@@ -68,8 +73,8 @@ class LLMAnalyzer:
         # Parse the LLM response
         analysis = self._parse_llm_response(result)
         
-        print(f"✅ Analysis complete: AI Score={analysis['ai_generated_score']}%, "
-              f"Dangerous={analysis['dangerous_content']}")
+        logger.info("✅ Analysis complete: AI Score=%s%%, Dangerous=%s",
+                    analysis['ai_generated_score'], analysis['dangerous_content'])
         
         return analysis
     
@@ -156,7 +161,7 @@ Respond ONLY with the JSON, no additional text."""
             }
         
         except (json.JSONDecodeError, ValueError) as e:
-            print(f"⚠️ Error parsing LLM response: {e}")
+            logger.warning("⚠️ Error parsing LLM response: %s", e)
             # Return safe defaults if parsing fails
             return {
                 "ai_generated_score": 0,
@@ -1,95 +1,143 @@
 """
 Whisper AI Transcription Service
-Converts audio to text using OpenAI's Whisper model
+Converts audio to text using faster-whisper (CTranslate2 Whisper backend)
 """
 
-import whisper
-import torch
-from typing import Dict, Any, Optional
+import logging
+import os
+import ctranslate2
+import numpy as np
+from faster_whisper import BatchedInferencePipeline, WhisperModel
+from typing import Dict, Any, Iterator, Optional, Tuple, Union
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 
 class WhisperTranscriber:
     """Service for transcribing audio using Whisper AI"""
     
-    def __init__(self, model_size: str = None):
+    def __init__(self, model_size: str = None, batch_size: int = None):
         """
         Initialize Whisper transcriber
         
         Args:
             model_size: Whisper model size (tiny, base, small, medium, large)
                        Defaults to settings.WHISPER_MODEL_SIZE
+            batch_size: Number of audio chunks decoded together per forward pass
+                       Defaults to settings.WHISPER_BATCH_SIZE
         """
         self.model_size = model_size or settings.WHISPER_MODEL_SIZE
+        self.batch_size = batch_size or settings.WHISPER_BATCH_SIZE
         self.model = None
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        print(f"🎤 Whisper will use device: {self.device}")
+        self.pipeline = None
+        self.device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+        # INT8 weights on CPU, INT8 weights with FP16 activations on GPU
+        self.compute_type = "int8_float16" if self.device == "cuda" else "int8"
+        logger.info("🎤 Whisper will use device: %s", self.device)
     
     def load_model(self):
         """Load Whisper model (lazy loading to save memory)"""
         if self.model is None:
-            print(f"📥 Loading Whisper model: {self.model_size}")
-            self.model = whisper.load_model(self.model_size, device=self.device)
-            print(f"✅ Whisper model loaded")
+            logger.info("📥 Loading Whisper model: %s", self.model_size)
+            self.model = WhisperModel(
+                self.model_size,
+                device=self.device,
+                compute_type=self.compute_type,
+                cpu_threads=os.cpu_count() or 0
+            )
+            # Batched pipeline splits audio on VAD boundaries and decodes
+            # chunks together to keep the GPU/CPU fully occupied
+            self.pipeline = BatchedInferencePipeline(model=self.model)
+            logger.info("✅ Whisper model loaded (%s)", self.compute_type)
     
-    def transcribe(self, audio_path: str, language: Optional[str] = None) -> Dict[str, Any]:
+    def transcribe_stream(self, audio: Union[str, np.ndarray],
+                          language: Optional[str] = None) -> Tuple[Iterator[Dict[str, Any]], str]:
         """
-        Transcribe audio file to text
+        Transcribe audio, yielding segments as Whisper decodes them
         
         Args:
-            audio_path: Path to audio file
+            audio: Path to audio file, or a 16kHz mono float32 waveform
             language: Optional language code (e.g., 'en', 'ko', 'ja')
                      Auto-detected if None
         
         Returns:
-            Dictionary with transcription results:
-            - text: Full transcription text
-            - language: Detected/specified language
-            - segments: List of timestamped segments
+            Tuple of (segment iterator, detected/specified language)
+            Each segment is a dict with start, end and text
         """
         # Load model if not already loaded
         self.load_model()
         
-        print(f"🎙️ Transcribing audio: {audio_path}")
+        if isinstance(audio, np.ndarray):
+            logger.info("🎙️ Transcribing in-memory audio: %.1f seconds", len(audio) / 16000)
+        else:
+            logger.info("🎙️ Transcribing audio: %s", audio)
         
-        # Transcribe with Whisper
-        options = {
-            "task": "transcribe",
-            "verbose": False,
-        }
+        # Transcribe with faster-whisper (segments are yielded lazily)
+        # Silero VAD drops silence/music before decoding; greedy decoding without
+        # conditioning on previous text avoids serial dependencies and hallucination loops
+        segments, info = self.pipeline.transcribe(
+            audio,
+            task="transcribe",
+            language=language,
+            vad_filter=True,
+            vad_parameters=dict(min_silence_duration_ms=500),
+            condition_on_previous_text=False,
+            beam_size=1,
+            best_of=1,
+            temperature=0.0,
+            batch_size=self.batch_size
+        )
         
-        if language:
-            options["language"] = language
+        segment_iter = (
+            {
+                "start": seg.start,
+                "end": seg.end,
+                "text": seg.text
+            }
+            for seg in segments
+        )
         
-        result = self.model.transcribe(audio_path, **options)
+        return segment_iter, info.language or "unknown"
+    
+    def transcribe(self, audio: Union[str, np.ndarray], language: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Transcribe audio to text
+        
+        Args:
+            audio: Path to audio file, or a 16kHz mono float32 waveform
+            language: Optional language code (e.g., 'en', 'ko', 'ja')
+                     Auto-detected if None
+        
+        Returns:
+            Dictionary with transcription results:
+            - text: Full transcription text
+            - language: Detected/specified language
+            - segments: List of timestamped segments
+        """
+        segment_iter, detected_language = self.transcribe_stream(audio, language)
+        segment_list = list(segment_iter)
         
-        print(f"✅ Transcription complete. Detected language: {result.get('language', 'unknown')}")
+        logger.info("✅ Transcription complete. Detected language: %s", detected_language)
         
         return {
-            "text": result["text"],
-            "language": result.get("language", "unknown"),
-            "segments": [
-                {
-                    "start": seg["start"],
-                    "end": seg["end"],
-                    "text": seg["text"]
-                }
-                for seg in result.get("segments", [])
-            ]
+            "text": "".join(seg["text"] for seg in segment_list),
+            "language": detected_language,
+            "segments": segment_list
         }
     
-    def transcribe_with_timestamps(self, audio_path: str, language: Optional[str] = None) -> str:
+    def transcribe_with_timestamps(self, audio: Union[str, np.ndarray], language: Optional[str] = None) -> str:
         """
         Transcribe audio with timestamps in readable format
         
         Args:
-            audio_path: Path to audio file
+            audio: Path to audio file, or a 16kHz mono float32 waveform
             language: Optional language code
         
         Returns:
             Formatted transcription with timestamps
         """
-        result = self.transcribe(audio_path, language)
+        result = self.transcribe(audio, language)
         
         # Format with timestamps
         formatted_lines = []
@@ -111,8 +159,8 @@ class WhisperTranscriber:
     def unload_model(self):
         """Unload model to free memory"""
         if self.model is not None:
+            del self.pipeline
             del self.model
+            self.pipeline = None
             self.model = None
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
-            print("🗑️ Whisper model unloaded")
+            logger.info("🗑️ Whisper model unloaded")
@@ -1,51 +1,106 @@
 """
 Celery Tasks for Video Analysis
-Orchestrates the full pipeline: download -> process -> transcribe -> analyze
+Orchestrates the full pipeline: download -> transcribe -> analyze
+
+Network-bound steps run on the "fast" queue (eventlet pool) and Whisper
+inference runs on the "gpu" queue (solo pool), so downloads and LLM calls
+overlap with transcription of other jobs.
 """
 
+import contextlib
+import logging
 import os
+import shutil
+import tempfile
+import threading
 from datetime import datetime
-from celery import Task
+from celery import Task, chain
 from sqlalchemy.orm import Session
-from app.celery_app import celery_app
+from app.celery_app import celery_app, get_transcriber
+from app.core.config import settings
 from app.models.database import SessionLocal
-from app.models.models import AnalysisJob
+from app.models.models import AnalysisJob, TranscriptSegment
 from app.services.downloader import YouTubeDownloader
-from app.services.media_proc import MediaProcessor
-from app.services.transcriber import WhisperTranscriber
 from app.services.llm_analyzer import LLMAnalyzer
 
+logger = logging.getLogger(__name__)
+
+# Segments are committed in batches of this size while transcribing
+SEGMENT_COMMIT_INTERVAL = 200
+
 
 class DatabaseTask(Task):
     """Base task with database session management"""
-    _db = None
+    # Thread-local (greenlet-local under eventlet), so concurrent tasks
+    # in the same worker process never share a session
+    _local = threading.local()
     
     @property
     def db(self) -> Session:
-        if self._db is None:
-            self._db = SessionLocal()
-        return self._db
+        if getattr(self._local, "db", None) is None:
+            self._local.db = SessionLocal()
+        return self._local.db
+    
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        """Mark the job as failed when any pipeline step raises"""
+        # The first step receives the job ID, later steps the previous step's payload
+        payload = args[0]
+        job_id = payload["job_id"] if isinstance(payload, dict) else payload
+        
+        logger.error("❌ Error in job #%s: %s", job_id, exc)
+        
+        self.db.rollback()
+        
+        # Drop the segments already committed by a transcription that failed partway
+        self.db.query(TranscriptSegment).filter(
+            TranscriptSegment.job_id == job_id
+        ).delete(synchronize_session=False)
+        
+        job = self.db.query(AnalysisJob).filter(AnalysisJob.id == job_id).first()
+        if job:
+            job.status = "failed"
+            job.error_message = str(exc)
+            job.completed_at = datetime.utcnow()
+        self.db.commit()
     
     def after_return(self, *args, **kwargs):
-        if self._db is not None:
-            self._db.close()
-            self._db = None
+        if getattr(self._local, "db", None) is not None:
+            self._local.db.close()
+            self._local.db = None
 
 
-@celery_app.task(bind=True, base=DatabaseTask, name="analyze_video")
-def analyze_video_task(self, job_id: int):
+def analyze_video_pipeline(job_id: int):
     """
-    Main task for analyzing a YouTube video
+    Build the task chain for analyzing a YouTube video
     
     Pipeline:
-    1. Download video/audio from YouTube
-    2. Extract and process audio
-    3. Transcribe with Whisper
-    4. Analyze with LLM
-    5. Store results in database
+    1. Download audio from YouTube as 16kHz mono WAV (fast queue)
+    2. Transcribe with Whisper (gpu queue)
+    3. Analyze with LLM and store results in database (fast queue)
     
     Args:
         job_id: Database ID of the AnalysisJob
+    
+    Returns:
+        Celery chain, submit it with .delay()
+    """
+    return chain(
+        download_audio_task.s(job_id),
+        transcribe_audio_task.s(),
+        analyze_content_task.s(),
+    )
+
+
+@celery_app.task(bind=True, base=DatabaseTask, name="download_audio", queue="fast")
+def download_audio_task(self, job_id: int):
+    """
+    Step 1: Fetch video metadata and download the audio track
+    
+    Args:
+        job_id: Database ID of the AnalysisJob
+    
+    Returns:
+        Payload with job_id, video_info, audio_dir and audio_path for the next step
     """
     
     # Get job from database
@@ -53,116 +108,153 @@ def analyze_video_task(self, job_id: int):
     if not job:
         raise ValueError(f"Job {job_id} not found")
     
-    try:
-        # Update status to processing
-        job.status = "processing"
-        self.db.commit()
-        
-        print(f"\n{'='*60}")
-        print(f"🎬 Starting analysis for Job #{job_id}")
-        print(f"📹 URL: {job.youtube_url}")
-        print(f"{'='*60}\n")
+    # Read what the download needs before committing expires the job, then
+    # release the connection so it isn't held through the network I/O below
+    youtube_url = job.youtube_url
+    
+    # Update status to processing
+    job.status = "processing"
+    self.db.commit()
+    self.db.close()
+    
+    logger.info("🎬 Starting analysis for Job #%d: %s", job_id, youtube_url)
+    logger.info("📥 Step 1/3: Downloading audio for Job #%d...", job_id)
+    
+    # Every file for this job lives in its own temp directory, removed as a whole
+    os.makedirs(settings.TEMP_DIR, exist_ok=True)
+    audio_dir = tempfile.mkdtemp(prefix=f"job_{job_id}_", dir=settings.TEMP_DIR)
+    
+    with contextlib.ExitStack() as cleanup:
+        # Delete partial downloads if anything below fails
+        cleanup.callback(shutil.rmtree, audio_dir, ignore_errors=True)
         
-        # Step 1: Download video and get metadata
-        print("📥 Step 1/4: Downloading video...")
-        downloader = YouTubeDownloader()
+        downloader = YouTubeDownloader(temp_dir=audio_dir)
         
         # Get video info first
-        video_info = downloader.get_video_info(job.youtube_url)
-        job.video_title = video_info.get('title', 'Unknown')
-        self.db.commit()
-        
-        print(f"📺 Video: {video_info['title']}")
-        print(f"⏱️ Duration: {video_info.get('duration', 0)} seconds")
-        
-        # Download audio only (faster and smaller)
-        audio_path = downloader.download_audio_only(job.youtube_url)
-        print(f"✅ Audio downloaded: {audio_path}")
-        
-        # Step 2: Process audio
-        print("\n🎵 Step 2/4: Processing audio...")
-        processor = MediaProcessor()
-        
-        # Convert to WAV for Whisper (optional, but optimal)
-        wav_path = processor.convert_to_wav(audio_path)
-        print(f"✅ Audio converted to WAV: {wav_path}")
-        
-        # Step 3: Transcribe with Whisper
-        print("\n🎤 Step 3/4: Transcribing audio...")
-        transcriber = WhisperTranscriber()
-        transcription_result = transcriber.transcribe(wav_path)
-        
-        transcription_text = transcription_result["text"]
-        detected_language = transcription_result["language"]
-        
-        print(f"✅ Transcription complete!")
-        print(f"🌍 Language: {detected_language}")
-        print(f"📝 Text length: {len(transcription_text)} characters")
-        print(f"📊 First 200 chars: {transcription_text[:200]}...")
-        
-        # Unload Whisper model to free memory
-        transcriber.unload_model()
-        
-        # Step 4: Analyze with LLM
-        print("\n🤖 Step 4/4: Analyzing content with LLM...")
-        analyzer = LLMAnalyzer()
-        analysis_result = analyzer.analyze_content(
-            transcription=transcription_text,
-            video_metadata=video_info
+        video_info = downloader.get_video_info(youtube_url)
+        self.db.query(AnalysisJob).filter(AnalysisJob.id == job_id).update(
+            {"video_title": video_info.get('title', 'Unknown')}
         )
-        
-        print(f"✅ Analysis complete!")
-        print(f"🎯 AI Generated Score: {analysis_result['ai_generated_score']}%")
-        print(f"⚠️ Dangerous Content: {analysis_result['dangerous_content']}")
-        if analysis_result['dangerous_content']:
-            print(f"🚨 Danger Categories: {', '.join(analysis_result['danger_categories'])}")
-            print(f"📊 Severity: {analysis_result['danger_severity']}")
-        
-        # Step 5: Store results
-        print("\n💾 Saving results to database...")
-        
-        # Combine all results
-        final_result = {
-            "video_info": video_info,
-            "transcription": {
-                "text": transcription_text,
-                "language": detected_language,
-                "segments": transcription_result.get("segments", [])
-            },
-            "analysis": analysis_result,
-            "processed_at": datetime.utcnow().isoformat()
-        }
-        
-        job.result = final_result
-        job.status = "completed"
-        job.completed_at = datetime.utcnow()
         self.db.commit()
+        self.db.close()
         
-        # Cleanup: Delete temporary files
-        print("\n🗑️ Cleaning up temporary files...")
-        try:
-            if os.path.exists(audio_path):
-                os.remove(audio_path)
-            if os.path.exists(wav_path):
-                os.remove(wav_path)
-            print("✅ Cleanup complete")
-        except Exception as cleanup_error:
-            print(f"⚠️ Cleanup warning: {cleanup_error}")
+        logger.info("📺 Video: %s (%s seconds)", video_info['title'], video_info.get('duration', 0))
         
-        print(f"\n{'='*60}")
-        print(f"✅ Job #{job_id} completed successfully!")
-        print(f"{'='*60}\n")
+        # Audio is handed to the gpu worker through the shared temp directory
+        audio_path = downloader.download_audio_only(youtube_url)
+        logger.info("✅ Audio downloaded: %s", audio_path)
         
-        return final_result
+        # Success: the transcribe step now owns (and removes) the directory
+        cleanup.pop_all()
+    
+    return {
+        "job_id": job_id,
+        "video_info": video_info,
+        "audio_dir": audio_dir,
+        "audio_path": audio_path,
+    }
+
+
+@celery_app.task(bind=True, base=DatabaseTask, name="transcribe_audio", queue="gpu")
+def transcribe_audio_task(self, payload: dict):
+    """
+    Step 2: Transcribe the downloaded audio with Whisper
+    
+    Segments are written to TranscriptSegment as they are decoded rather
+    than being carried through the rest of the pipeline.
+    
+    Args:
+        payload: Output of download_audio_task
     
-    except Exception as e:
-        # Handle errors
-        print(f"\n❌ Error in job #{job_id}: {str(e)}")
+    Returns:
+        Payload with job_id, video_info and transcription for the next step
+    """
+    job_id = payload["job_id"]
+    audio_path = payload["audio_path"]
+    
+    logger.info("🎤 Step 2/3: Transcribing audio for Job #%d...", job_id)
+    
+    try:
+        transcriber = get_transcriber()
+        segments, detected_language = transcriber.transcribe_stream(audio_path)
         
-        job.status = "failed"
-        job.error_message = str(e)
-        job.completed_at = datetime.utcnow()
-        self.db.commit()
+        # Drop segments left behind by a previous attempt at this job
+        self.db.query(TranscriptSegment).filter(TranscriptSegment.job_id == job_id).delete()
         
-        # Re-raise for Celery to handle
-        raise
+        text_parts = []
+        for idx, segment in enumerate(segments):
+            self.db.add(TranscriptSegment(job_id=job_id, idx=idx, **segment))
+            text_parts.append(segment["text"])
+            if (idx + 1) % SEGMENT_COMMIT_INTERVAL == 0:
+                self.db.commit()
+        self.db.commit()
+    finally:
+        # Always delete the job's temp files, whether or not transcription succeeded
+        shutil.rmtree(payload["audio_dir"], ignore_errors=True)
+    
+    transcription_text = "".join(text_parts)
+    
+    logger.info("✅ Transcription complete! Language: %s, %d segments, text length: %d characters",
+                detected_language, len(text_parts), len(transcription_text))
+    logger.debug("📊 First 200 chars: %s...", transcription_text[:200])
+    
+    return {
+        "job_id": job_id,
+        "video_info": payload["video_info"],
+        "transcription": {
+            "text": transcription_text,
+            "language": detected_language,
+            "segment_count": len(text_parts)
+        },
+    }
+
+
+@celery_app.task(bind=True, base=DatabaseTask, name="analyze_content", queue="fast")
+def analyze_content_task(self, payload: dict):
+    """
+    Step 3: Analyze the transcription with the LLM and store results
+    
+    Args:
+        payload: Output of transcribe_audio_task
+    
+    Returns:
+        Final analysis result stored on the job
+    """
+    job_id = payload["job_id"]
+    video_info = payload["video_info"]
+    transcription = payload["transcription"]
+    
+    logger.info("🤖 Step 3/3: Analyzing content with LLM for Job #%d...", job_id)
+    analyzer = LLMAnalyzer()
+    analysis_result = analyzer.analyze_content(
+        transcription=transcription["text"],
+        video_metadata=video_info
+    )
+    
+    if analysis_result['dangerous_content']:
+        logger.warning("🚨 Dangerous content in Job #%d: %s (severity: %s)",
+                       job_id, analysis_result['danger_categories'], analysis_result['danger_severity'])
+    
+    # Store results
+    logger.info("💾 Saving results for Job #%d...", job_id)
+    
+    job = self.db.query(AnalysisJob).filter(AnalysisJob.id == job_id).first()
+    if not job:
+        raise ValueError(f"Job {job_id} not found")
+    
+    # Combine all results
+    final_result = {
+        "video_info": video_info,
+        "transcription": transcription,
+        "analysis": analysis_result,
+        "processed_at": datetime.utcnow().isoformat()
+    }
+    
+    job.result = final_result
+    job.status = "completed"
+    job.completed_at = datetime.utcnow()
+    self.db.commit()
+    
+    logger.info("✅ Job #%d completed successfully!", job_id)
+    
+    return final_result